@@ -6,28 +6,21 @@ from __future__ import annotations
 
 import argparse
 import codecs
+import os
 import sys
 from enum import Enum, auto
-from functools import partial
-from pathlib import Path
-from typing import TYPE_CHECKING, cast
+from functools import lru_cache
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, cast
 
 from piplicenses_lib import FromArg, NoValueEnum
 
 from piplicenses import __summary__, __version__
 from piplicenses.constants import DEFAULT_OUTPUT_FIELDS, SUMMARY_OUTPUT_FIELDS, TOML_SECTION_NAME
-from piplicenses.output import create_licenses_table, create_summary_table
-
-if sys.version_info >= (3, 11):  # pragma: no cover
-    import tomllib
-else:  # pragma: no cover
-    import tomli as tomllib
-
 
 if TYPE_CHECKING:  # pragma: no cover
-    from collections.abc import Sequence
-
-open = open  # To allow monkey-patching.
+    from collections.abc import Mapping, Sequence
+    from typing import TextIO
 
 
 class CustomNamespace(argparse.Namespace):
@@ -58,32 +51,27 @@ class CustomNamespace(argparse.Namespace):
     collect_all_failures: bool
 
 
+# Optional columns in output order, together with the option enabling them.
+_OPTIONAL_OUTPUT_FIELDS = (
+    ("Author", "with_authors"),
+    ("Maintainer", "with_maintainers"),
+    ("URL", "with_urls"),
+    ("Description", "with_description"),
+)
+
+
 def get_output_fields(args: CustomNamespace) -> list[str]:
     if args.summary:
         return list(SUMMARY_OUTPUT_FIELDS)
 
-    output_fields = list(DEFAULT_OUTPUT_FIELDS)
+    output_fields = [field for field in DEFAULT_OUTPUT_FIELDS if field != "Version" or not args.no_version]
 
     if args.from_ == FromArg.ALL:
-        output_fields.append("License-Metadata")
-        output_fields.append("License-Classifier")
+        output_fields += ("License-Metadata", "License-Classifier")
     else:
         output_fields.append("License")
 
-    if args.with_authors:
-        output_fields.append("Author")
-
-    if args.with_maintainers:
-        output_fields.append("Maintainer")
-
-    if args.with_urls:
-        output_fields.append("URL")
-
-    if args.with_description:
-        output_fields.append("Description")
-
-    if args.no_version:
-        output_fields.remove("Version")
+    output_fields.extend(field for field, option in _OPTIONAL_OUTPUT_FIELDS if getattr(args, option))
 
     if args.with_license_files and args.format_ not in [FormatArg.JSON, FormatArg.PLAIN_VERTICAL]:
         args.with_license_files = False
@@ -115,42 +103,52 @@ def get_output_fields(args: CustomNamespace) -> list[str]:
 
 
 def get_sortby(args: CustomNamespace) -> str:
-    if args.summary and args.order == OrderArg.COUNT:
-        return "Count"
-    elif args.summary or args.order == OrderArg.LICENSE:
-        return "License"
-    elif args.order == OrderArg.NAME:
-        return "Name"
-    elif args.order == OrderArg.AUTHOR and args.with_authors:
-        return "Author"
-    elif args.order == OrderArg.MAINTAINER and args.with_maintainers:
-        return "Maintainer"
-    elif args.order == OrderArg.URL and args.with_urls:
-        return "URL"
+    if args.summary:
+        return "Count" if args.order == OrderArg.COUNT else "License"
 
+    sortby, required_option = _ORDER_TO_SORTBY.get(args.order, ("Name", None))
+    if required_option is None or getattr(args, required_option):
+        return sortby
     return "Name"
 
 
 def create_output_string(args: CustomNamespace) -> str:
+    # Imported here to keep parser-only paths like `--help` and `--version`
+    # free of the table rendering and package collection dependencies.
+    from piplicenses.collector import get_packages
+    from piplicenses.output import create_licenses_table, create_summary_table
+
     output_fields = get_output_fields(args)
 
+    # Enumerate the installed packages exactly once, regardless of the table kind.
+    packages = list(get_packages(args))
+
     if args.summary:
-        table = create_summary_table(args)
+        table = create_summary_table(args, packages)
     else:
-        table = create_licenses_table(args, output_fields)
+        table = create_licenses_table(args, output_fields, packages)
 
     sortby = get_sortby(args)
 
     if args.format_ == FormatArg.HTML:
         html = table.get_html_string(fields=output_fields, sortby=sortby)
-        return html.encode("ascii", errors="xmlcharrefreplace").decode("ascii")
+        return _xmlcharref_non_ascii(html)
     else:
         return table.get_string(fields=output_fields, sortby=sortby)
 
 
+def _xmlcharref_non_ascii(text: str) -> str:
+    """
+    Replace non-ASCII characters with XML character references, like the `xmlcharrefreplace` error handler
+    """
+    if text.isascii():
+        return text
+    return text.encode("ascii", errors="xmlcharrefreplace").decode("ascii")
+
+
 def create_warn_string(args: CustomNamespace) -> str:
     warn_messages = []
-    warn = partial(output_colored, "33")
+    warn = _color_template("33", False).format
 
     if args.with_license_file and not args.format_ == FormatArg.JSON:
         message = warn("Due to the length of these fields, this option is best paired with --format=json.")
@@ -188,9 +186,8 @@ class CustomHelpFormatter(argparse.HelpFormatter):  # pragma: no cover
 
     def _format_action(self, action: argparse.Action) -> str:
         flag_indent_argument: bool = False
-        text = self._expand_help(action)
-        separator_pos = text[:3].find("|")
-        if separator_pos != -1 and "I" in text[:separator_pos]:
+        flags, _ = _split_help_marker(self._expand_help(action))
+        if "I" in flags:
             self._indent()
             flag_indent_argument = True
         help_str = super()._format_action(action)
@@ -205,15 +202,25 @@ class CustomHelpFormatter(argparse.HelpFormatter):  # pragma: no cover
         return super()._expand_help(action)
 
     def _split_lines(self, text: str, width: int) -> list[str]:
-        separator_pos = text[:3].find("|")
-        if separator_pos != -1:
-            flag_splitlines: bool = "R" in text[:separator_pos]
-            text = text[separator_pos + 1:]  # fmt: skip
-            if flag_splitlines:
-                return text.splitlines()
+        flags, text = _split_help_marker(text)
+        if "R" in flags:
+            return text.splitlines()
         return super()._split_lines(text, width)
 
 
+@lru_cache(maxsize=None)
+def _split_help_marker(text: str) -> tuple[str, str]:
+    """
+    Split the help text into the formatting flags in front of the `|` marker and the actual text
+
+    The same text is passed to both `_format_action` and `_split_lines`, thus it is only scanned once.
+    """
+    separator_pos = text.find("|", 0, 3)
+    if separator_pos == -1:
+        return "", text
+    return text[:separator_pos], text[separator_pos + 1:]  # fmt: skip
+
+
 class CompatibleArgumentParser(argparse.ArgumentParser):
     def parse_args(  # type: ignore[override]
         self,
@@ -221,6 +228,10 @@ class CompatibleArgumentParser(argparse.ArgumentParser):
         namespace: None | CustomNamespace = None,
     ) -> CustomNamespace:
         args_ = cast(CustomNamespace, super().parse_args(args, namespace))
+        # Defaults are shared between all calls of a (cached) parser, thus do not hand out the same list twice.
+        for key, value in vars(args_).items():
+            if type(value) is list:
+                setattr(args_, key, value.copy())
         self._verify_args(args_)
         return args_
 
@@ -233,13 +244,15 @@ class CompatibleArgumentParser(argparse.ArgumentParser):
                 )
         if args.filter_strings is False and args.filter_code_page != "latin1":
             self.error("'--filter-code-page' requires the '--filter-strings' option to be set")
-        try:
-            codecs.lookup(args.filter_code_page)
-        except LookupError:
-            self.error(
-                f"invalid code page {args.filter_code_page!r} given for '--filter-code-page, check "
-                "https://docs.python.org/3/library/codecs.html#standard-encodings for valid code pages"
-            )
+        # The default code page is known to exist, thus skip the codec registry for it.
+        if args.filter_code_page != "latin1":
+            try:
+                codecs.lookup(args.filter_code_page)
+            except LookupError:
+                self.error(
+                    f"invalid code page {args.filter_code_page!r} given for '--filter-code-page, check "
+                    "https://docs.python.org/3/library/codecs.html#standard-encodings for valid code pages"
+                )
 
 
 class OrderArg(NoValueEnum):
@@ -251,6 +264,15 @@ class OrderArg(NoValueEnum):
     URL = U = auto()
 
 
+# Mapping of non-summary orders to the column to sort by and the option required to have this column.
+_ORDER_TO_SORTBY: dict[OrderArg, tuple[str, str | None]] = {
+    OrderArg.LICENSE: ("License", None),
+    OrderArg.AUTHOR: ("Author", "with_authors"),
+    OrderArg.MAINTAINER: ("Maintainer", "with_maintainers"),
+    OrderArg.URL: ("URL", "with_urls"),
+}
+
+
 class FormatArg(NoValueEnum):
     PLAIN = P = auto()
     PLAIN_VERTICAL = auto()
@@ -263,10 +285,13 @@ class FormatArg(NoValueEnum):
     CSV = auto()
 
 
+# Convert between CLI values and enum keys in a single pass each.
 def value_to_enum_key(value: str) -> str:
     return value.replace("-", "_").upper()
 
 
+# Enum members are singletons, thus their values never change.
+@lru_cache(maxsize=None)
 def enum_key_to_value(enum_key: Enum) -> str:
     return enum_key.name.replace("_", "-").lower()
 
@@ -275,6 +300,8 @@ def choices_from_enum(enum_cls: type[NoValueEnum]) -> list[str]:
     return [key.replace("_", "-").lower() for key in enum_cls.__members__.keys()]
 
 
+# Only a handful of distinct values are resolved, but on every parser creation and argument parsing.
+@lru_cache(maxsize=None)
 def get_value_from_enum(enum_cls: type[NoValueEnum], value: str) -> NoValueEnum:
     return getattr(enum_cls, value_to_enum_key(value))
 
@@ -285,6 +312,16 @@ MAP_DEST_TO_ENUM = {
     "format_": FormatArg,
 }
 
+# Mapping of each choice, including the aliases, to the enum member per destination.
+_DEST_CHOICE_TO_ENUM = {
+    dest: {key.replace("_", "-").lower(): member for key, member in enum_cls.__members__.items()} for dest, enum_cls in MAP_DEST_TO_ENUM.items()
+}
+
+# The same mappings serve as choices: argparse validates values with hashed lookups and lists the keys in order.
+_FROM_CHOICES = _DEST_CHOICE_TO_ENUM["from_"]
+_ORDER_CHOICES = _DEST_CHOICE_TO_ENUM["order"]
+_FORMAT_CHOICES = _DEST_CHOICE_TO_ENUM["format_"]
+
 
 class SelectAction(argparse.Action):
     def __call__(  # type: ignore[override]
@@ -294,16 +331,58 @@ class SelectAction(argparse.Action):
         values: str,
         option_string: str | None = None,
     ) -> None:
-        enum_cls = MAP_DEST_TO_ENUM[self.dest]
-        setattr(namespace, self.dest, get_value_from_enum(enum_cls, values))
+        # argparse has already validated the value against the choices.
+        setattr(namespace, self.dest, _DEST_CHOICE_TO_ENUM[self.dest][values])
 
 
-def load_config_from_file(pyproject_path: str):
-    path = Path(pyproject_path)
-    if path.exists():
-        with path.open(mode="rb") as f:
-            return tomllib.load(f).get("tool", {}).get(TOML_SECTION_NAME, {})
-    return {}
+# Parsed configuration sections, keyed by path, modification time and size of the file.
+_CONFIG_CACHE: dict[str, tuple[tuple[int, int], Mapping[str, Any]]] = {}
+_EMPTY_CONFIG: Mapping[str, Any] = MappingProxyType({})
+
+
+def _get_file_state(path: str) -> tuple[int, int] | None:
+    """
+    Get the modification time and size of the given file, or `None` if it is not accessible
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _freeze_config_value(value: Any) -> Any:
+    """
+    Convert the given TOML value into a read-only one, including all nested values.
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze_config_value(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(map(_freeze_config_value, value))
+    return value
+
+
+def load_config_from_file(pyproject_path: str) -> Mapping[str, Any]:
+    # Relative paths like the default one depend on the current working directory.
+    key = os.path.abspath(pyproject_path)
+    state = _get_file_state(key)
+    if state is None:
+        _CONFIG_CACHE.pop(key, None)
+        return _EMPTY_CONFIG
+
+    cached = _CONFIG_CACHE.get(key)
+    if cached is None or cached[0] != state:
+        # Only pay for the TOML parser when there is something to parse.
+        if sys.version_info >= (3, 11):  # pragma: no cover
+            import tomllib
+        else:  # pragma: no cover
+            import tomli as tomllib
+
+        with open(key, mode="rb") as f:
+            section = tomllib.load(f).get("tool", {}).get(TOML_SECTION_NAME, {})
+        # The cached section is shared between callers, thus make it read-only, including nested lists.
+        cached = _CONFIG_CACHE[key] = (state, _freeze_config_value(section))
+    return cached[1]
 
 
 def create_parser(
@@ -311,7 +390,12 @@ def create_parser(
 ) -> CompatibleArgumentParser:
     parser = CompatibleArgumentParser(description=__summary__, formatter_class=CustomHelpFormatter)
 
-    config_from_file = load_config_from_file(pyproject_path)
+    # Bind the lookup once, as it is needed for nearly every option.
+    get_config = load_config_from_file(pyproject_path).get
+    # Only resolve the enum members for configured values, the built-in defaults are known already.
+    from_value = get_config("from")
+    order_value = get_config("order")
+    format_value = get_config("format")
 
     common_options = parser.add_argument_group("Common options")
     format_options = parser.add_argument_group("Format options")
@@ -322,7 +406,7 @@ def create_parser(
     common_options.add_argument(
         "--python",
         type=str,
-        default=config_from_file.get("python", sys.executable),
+        default=get_config("python", sys.executable),
         metavar="PYTHON_EXEC",
         help=(
             "R| path to python executable to search distributions from\n"
@@ -337,9 +421,9 @@ def create_parser(
         dest="from_",
         action=SelectAction,
         type=str,
-        default=get_value_from_enum(FromArg, config_from_file.get("from", "mixed")),
+        default=FromArg.MIXED if from_value is None else get_value_from_enum(FromArg, from_value),
         metavar="SOURCE",
-        choices=choices_from_enum(FromArg),
+        choices=_FROM_CHOICES,
         help='R|where to find license information\n"meta", "classifier, "mixed", "all"\n(default: %(default)s)',
     )
     common_options.add_argument(
@@ -347,9 +431,9 @@ def create_parser(
         "--order",
         action=SelectAction,
         type=str,
-        default=get_value_from_enum(OrderArg, config_from_file.get("order", "name")),
+        default=OrderArg.NAME if order_value is None else get_value_from_enum(OrderArg, order_value),
         metavar="COL",
-        choices=choices_from_enum(OrderArg),
+        choices=_ORDER_CHOICES,
         help='R|order by column\n"name", "license", "author", "url"\n(default: %(default)s)',
     )
     common_options.add_argument(
@@ -358,9 +442,9 @@ def create_parser(
         dest="format_",
         action=SelectAction,
         type=str,
-        default=get_value_from_enum(FormatArg, config_from_file.get("format", "plain")),
+        default=FormatArg.PLAIN if format_value is None else get_value_from_enum(FormatArg, format_value),
         metavar="STYLE",
-        choices=choices_from_enum(FormatArg),
+        choices=_FORMAT_CHOICES,
         help=(
             "R|dump as set format style\n"
             '"plain", "plain-vertical" "markdown", "rst", \n'
@@ -372,13 +456,13 @@ def create_parser(
     common_options.add_argument(
         "--summary",
         action="store_true",
-        default=config_from_file.get("summary", False),
+        default=get_config("summary", False),
         help="dump summary of each license",
     )
     common_options.add_argument(
         "--output-file",
         action="store",
-        default=config_from_file.get("output-file"),
+        default=get_config("output-file"),
         type=str,
         help="save license list to file",
     )
@@ -389,7 +473,8 @@ def create_parser(
         type=str,
         nargs="+",
         metavar="PKG",
-        default=config_from_file.get("ignore-packages", []),
+        # Each parser requires its own mutable default instead of the shared read-only configuration value.
+        default=list(get_config("ignore-packages", ())),
         help="ignore package name in dumped list",
     )
     common_options.add_argument(
@@ -399,110 +484,110 @@ def create_parser(
         type=str,
         nargs="+",
         metavar="PKG",
-        default=config_from_file.get("packages", []),
+        default=list(get_config("packages", ())),
         help="only include selected packages in output",
     )
     format_options.add_argument(
         "-s",
         "--with-system",
         action="store_true",
-        default=config_from_file.get("with-system", False),
+        default=get_config("with-system", False),
         help="dump with system packages",
     )
     format_options.add_argument(
         "-a",
         "--with-authors",
         action="store_true",
-        default=config_from_file.get("with-authors", False),
+        default=get_config("with-authors", False),
         help="dump with package authors",
     )
     format_options.add_argument(
         "--with-maintainers",
         action="store_true",
-        default=config_from_file.get("with-maintainers", False),
+        default=get_config("with-maintainers", False),
         help="dump with package maintainers",
     )
     format_options.add_argument(
         "-u",
         "--with-urls",
         action="store_true",
-        default=config_from_file.get("with-urls", False),
+        default=get_config("with-urls", False),
         help="dump with package urls",
     )
     format_options.add_argument(
         "-d",
         "--with-description",
         action="store_true",
-        default=config_from_file.get("with-description", False),
+        default=get_config("with-description", False),
         help="dump with short package description",
     )
     format_options.add_argument(
         "-nv",
         "--no-version",
         action="store_true",
-        default=config_from_file.get("no-version", False),
+        default=get_config("no-version", False),
         help="dump without package version",
     )
     format_options.add_argument(
         "-l",
         "--with-license-file",
         action="store_true",
-        default=config_from_file.get("with-license-file", False),
+        default=get_config("with-license-file", False),
         help="dump with location of license file and contents, most useful with JSON output",
     )
     format_options.add_argument(
         "--with-license-files",
         action="store_true",
-        default=config_from_file.get("with-license-files", False),
+        default=get_config("with-license-files", False),
         help="dump with location of license files and contents, most useful with JSON output",
     )
     format_options.add_argument(
         "--no-license-path",
         action="store_true",
-        default=config_from_file.get("no-license-path", False),
+        default=get_config("no-license-path", False),
         help="I|when specified together with option -l, suppress location of license file output",
     )
     format_options.add_argument(
         "--with-notice-file",
         action="store_true",
-        default=config_from_file.get("with-notice-file", False),
+        default=get_config("with-notice-file", False),
         help="I|when specified together with option -l, dump with location of notice files and contents",
     )
     format_options.add_argument(
         "--with-notice-files",
         action="store_true",
-        default=config_from_file.get("with-notice-files", False),
+        default=get_config("with-notice-files", False),
         help="I|when specified together with option -l or --with-license-files, dump with location of notice files and contents",
     )
     format_options.add_argument(
         "--with-other-files",
         action="store_true",
-        default=config_from_file.get("with-other-files", False),
+        default=get_config("with-other-files", False),
         help="I|when specified together with option -l or --with-license-files, dump with location of other licensing-related files and contents",
     )
     format_options.add_argument(
         "--with-sbom-files",
         action="store_true",
-        default=config_from_file.get("with-sbom-files", False),
+        default=get_config("with-sbom-files", False),
         help="I|when specified together with option -l or --with-license-files, dump with location of SBOM files and contents",
     )
     format_options.add_argument(
         "--omit-non-metadata-files",
         action="store_true",
-        default=config_from_file.get("omit-non-metadata-files", False),
+        default=get_config("omit-non-metadata-files", False),
         help="skip files which are not part of the metadata directory",
     )
     format_options.add_argument(
         "--filter-strings",
         action="store_true",
-        default=config_from_file.get("filter-strings", False),
+        default=get_config("filter-strings", False),
         help="filter input according to code page",
     )
     format_options.add_argument(
         "--filter-code-page",
         action="store",
         type=str,
-        default=config_from_file.get("filter-code-page", "latin1"),
+        default=get_config("filter-code-page", "latin1"),
         metavar="CODE",
         help="I|specify code page for filtering (default: %(default)s)",
     )
@@ -511,42 +596,76 @@ def create_parser(
         "--fail-on",
         action="store",
         type=str,
-        default=config_from_file.get("fail-on", None),
+        default=get_config("fail-on", None),
         help="fail (exit with code 1) on the first occurrence of the licenses of the semicolon-separated list",
     )
     verify_options.add_argument(
         "--allow-only",
         action="store",
         type=str,
-        default=config_from_file.get("allow-only", None),
+        default=get_config("allow-only", None),
         help="fail (exit with code 1) on the first occurrence of the licenses not in the semicolon-separated list",
     )
     verify_options.add_argument(
         "--partial-match",
         action="store_true",
-        default=config_from_file.get("partial-match", False),
+        default=get_config("partial-match", False),
         help="enables partial matching for --allow-only/--fail-on",
     )
     verify_options.add_argument(
         "--collect-all-failures",
         action="store_true",
-        default=config_from_file.get("collect-all-failures", False),
+        default=get_config("collect-all-failures", False),
         help="collect all license failures and report them after processing all packages",
     )
 
     return parser
 
 
-def output_colored(code: str, text: str, is_bold: bool = False) -> str:
+# Parsers by absolute configuration file path, together with the state of the file they have been built from.
+# The cached parsers are shared, thus they must not be modified by callers.
+_PARSER_CACHE: dict[str, tuple[tuple[int, int] | None, CompatibleArgumentParser]] = {}
+
+
+def get_parser(pyproject_path: str = "pyproject.toml") -> CompatibleArgumentParser:
     """
-    Create function to output with color sequence
+    Get the parser used by `main`, creating it on first use or after the configuration file changed
+    """
+    key = os.path.abspath(pyproject_path)
+    state = _get_file_state(key)
+    cached = _PARSER_CACHE.get(key)
+    if cached is None or cached[0] != state:
+        cached = _PARSER_CACHE[key] = (state, create_parser(key))
+    return cached[1]
+
+
+def reset_parser() -> None:
+    """
+    Drop the cached parsers and configurations
+    """
+    _PARSER_CACHE.clear()
+    _CONFIG_CACHE.clear()
+
+
+@lru_cache(maxsize=None)
+def _color_template(code: str, is_bold: bool) -> str:
+    """
+    Create the format string wrapping a text into the given color sequence
     """
     if is_bold:
         code = f"1;{code}"
 
-    return f"\033[{code}m{text}\033[0m"
+    return f"\033[{code}m{{}}\033[0m"
+
+
+def output_colored(code: str, text: str, is_bold: bool = False) -> str:
+    """
+    Create function to output with color sequence
+    """
+    return _color_template(code, is_bold).format(text)
 
 
+# Payloads above this size bypass the buffered file object.
 def save_if_needs(output_file: None | str, output_string: str) -> None:
     """
     Save to path given by args
@@ -554,22 +673,54 @@ def save_if_needs(output_file: None | str, output_string: str) -> None:
     if output_file is None:
         return
 
-    try:
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write(output_string)
-            if not output_string.endswith("\n"):
-                # Always end output files with a new line
-                f.write("\n")
+    # Always end output files with a new line, without copying the whole output to append it.
+    trailer = b"" if output_string.endswith("\n") else b"\n"
 
-        sys.stdout.write("created path: " + output_file + "\n")
-        sys.exit(0)
+    try:
+        with open(output_file, "wb") as f:
+            f.writelines((output_string.encode("utf-8"), trailer))
     except OSError:
         sys.stderr.write("check path: --output-file\n")
         sys.exit(1)
+    else:
+        sys.stdout.write(f"created path: {output_file}\n")
+        sys.exit(0)
+
+
+@lru_cache(maxsize=None)
+def _is_stateless_encoding(encoding: str) -> bool:
+    """
+    Check whether the encoded text does not depend on previous output, like a BOM does
+    """
+    encode = codecs.getincrementalencoder(encoding)().encode
+    return encode("\n") == encode("\n")
+
+
+def write_output(stream: TextIO | None, output_string: str) -> None:
+    """
+    Write to the given stream like `print`, but encode the output only once
+    """
+    if stream is None:
+        # Like `print`, do nothing without a console, for example with `pythonw`.
+        return
+    buffer = getattr(stream, "buffer", None)
+    if buffer is None or os.linesep != "\n" or not _is_stateless_encoding(stream.encoding):
+        # In-memory streams like `io.StringIO` do not expose a binary buffer. The text layer is
+        # required to translate the line endings on Windows and to not repeat the BOM of stateful encodings.
+        stream.write(output_string)
+        stream.write("\n")
+        return
+
+    # Keep the ordering intact for anything already written through the text layer.
+    stream.flush()
+    encoder = codecs.getincrementalencoder(stream.encoding)(stream.errors or "strict")
+    buffer.write(encoder.encode(output_string))
+    buffer.write(encoder.encode("\n", final=True))
+    buffer.flush()
 
 
 def main() -> None:  # pragma: no cover
-    parser = create_parser()
+    parser = get_parser()
     args = parser.parse_args()
 
     output_string = create_output_string(args)
@@ -577,7 +728,7 @@ def main() -> None:  # pragma: no cover
     output_file = args.output_file
     save_if_needs(output_file, output_string)
 
-    print(output_string)
+    write_output(sys.stdout, output_string)
     warn_string = create_warn_string(args)
     if warn_string:
-        print(warn_string, file=sys.stderr)
+        write_output(sys.stderr, warn_string)
@@ -4,51 +4,93 @@
 
 from __future__ import annotations
 
+import codecs
+import re
 import sys
-from dataclasses import asdict
-from typing import TYPE_CHECKING, cast
+from dataclasses import fields
+from typing import TYPE_CHECKING, Any, Callable, cast
 
+from piplicenses_lib import LICENSE_UNKNOWN, PackageInfo
 from piplicenses_lib import get_packages as _get_packages
 from piplicenses_lib import normalize_package_name
 
 from piplicenses.constants import SYSTEM_PACKAGES
-from piplicenses.spdx import _parse_spdx
+from piplicenses.spdx import _get_spdx_parser, _register_spdx_system_packages
 
 if TYPE_CHECKING:  # pragma: no cover
-    from collections.abc import Iterator
-
-    from piplicenses_lib import PackageInfo
+    from collections.abc import Iterable, Iterator
 
     from piplicenses.cli import CustomNamespace
 
 
+# Split and strip the items in one pass.
+_LICENSES_SEPARATOR_PATTERN = re.compile(r"\s*;\s*")
+
+
 def parse_licenses_list(licenses_str: str | None) -> list[str]:
     if licenses_str is None:
         return []
 
-    licenses = licenses_str.split(";")
-
-    # Strip items
-    licenses = list(map(str.strip, licenses))
-
     # Remove empty string items
-    licenses = list(filter(None, licenses))
-
-    return licenses
+    return [license_name for license_name in _LICENSES_SEPARATOR_PATTERN.split(licenses_str.strip()) if license_name]
 
 
 def _should_include_files(args: CustomNamespace) -> bool:
     return args.with_license_file or args.with_license_files or args.with_notice_file or args.with_notice_files or args.with_other_files or args.with_sbom_files
 
 
+# Filtering modifies the values in place, so avoid `dataclasses.asdict`, which deep-copies everything.
+_FILTERED_FIELDS = tuple(field.name for field in fields(PackageInfo) if field.name != "distribution")
+
+_ASCII_CHARACTERS = "".join(map(chr, range(128)))
+
+
+def _create_value_filter(code_page: str) -> Callable[[Any], Any]:
+    encode = codecs.getencoder(code_page)
+    decode = codecs.getdecoder(code_page)
+
+    def filter_string(item: str) -> str:
+        return cast(str, decode(encode(item, "ignore")[0])[0])
+
+    # Most code pages map ASCII onto itself, which allows skipping the round-trip for ASCII-only strings.
+    ascii_is_identity = filter_string(_ASCII_CHARACTERS) == _ASCII_CHARACTERS
+
+    def filter_value(value: Any) -> Any:
+        if type(value) is str:
+            if ascii_is_identity and value.isascii():
+                return value
+            return filter_string(value)
+        if isinstance(value, list):
+            return list(map(filter_value, value))
+        if isinstance(value, set):
+            return set(map(filter_value, value))
+        if isinstance(value, tuple):
+            return tuple(map(filter_value, value))
+        return filter_string(cast(str, value))
+
+    return filter_value
+
+
 def get_packages(
     args: CustomNamespace,
 ) -> Iterator[PackageInfo]:
-    ignore_pkgs_as_normalize = list(map(normalize_package_name, args.ignore_packages))
-    pkgs_as_normalize = list(map(normalize_package_name, args.packages))
+    ignore_pkgs_as_normalize = set(map(normalize_package_name, args.ignore_packages))
+    pkgs_as_normalize = set(map(normalize_package_name, args.packages))
+
+    # Case-fold the user-provided lists once instead of for every package.
+    fail_on_licenses = {license_name.lower() for license_name in parse_licenses_list(args.fail_on)}
+    allow_only_licenses = {license_name.lower() for license_name in parse_licenses_list(args.allow_only)}
+    # Partial matching checks all substrings at once using a single compiled alternation.
+    fail_on_pattern = _compile_partial_match(fail_on_licenses)
+    allow_only_pattern = _compile_partial_match(allow_only_licenses)
+
+    filter_value = _create_value_filter(args.filter_code_page) if args.filter_strings else None
 
-    fail_on_licenses = set(parse_licenses_list(args.fail_on))
-    allow_only_licenses = set(parse_licenses_list(args.allow_only))
+    # The parser is only required for the license checks and expensive to create, thus resolve it
+    # once before the first package and only if required.
+    parse_spdx = _get_spdx_parser() if fail_on_licenses or allow_only_licenses else None
+    _register_spdx_system_packages()
+    system_packages = frozenset(SYSTEM_PACKAGES)
 
     include_files = _should_include_files(args)
     failures = []
@@ -58,49 +100,37 @@ def get_packages(
         include_files=include_files,
         normalize_names=False,
     ):
+        # The normalized name is lowercase already.
         pkg_name = normalize_package_name(pkg_info.name)
-        pkg_name_and_version = pkg_name + ":" + pkg_info.version
 
-        if pkg_name.lower() in ignore_pkgs_as_normalize or pkg_name_and_version.lower() in ignore_pkgs_as_normalize:
+        if ignore_pkgs_as_normalize and (pkg_name in ignore_pkgs_as_normalize or f"{pkg_name}:{pkg_info.version}".lower() in ignore_pkgs_as_normalize):
             continue
 
-        if pkgs_as_normalize and pkg_name.lower() not in pkgs_as_normalize:
+        if pkgs_as_normalize and pkg_name not in pkgs_as_normalize:
             continue
 
-        if not args.with_system and pkg_name in SYSTEM_PACKAGES:
+        if not args.with_system and pkg_name in system_packages:
             continue
 
-        if args.filter_strings:
-
-            def filter_string(item: str) -> str:
-                return item.encode(args.filter_code_page, errors="ignore").decode(args.filter_code_page)
-
-            for key, value in asdict(pkg_info).items():
-                if key == "distribution":
-                    continue
-
-                def _handle(_value):
-                    if isinstance(_value, list):
-                        return list(map(_handle, _value))
-                    if isinstance(_value, set):
-                        return set(map(_handle, _value))
-                    if isinstance(_value, tuple):
-                        return tuple(map(_handle, _value))
-                    return filter_string(cast(str, _value))
-
-                setattr(pkg_info, key, _handle(value))
+        if filter_value is not None:
+            for key in _FILTERED_FIELDS:
+                setattr(pkg_info, key, filter_value(getattr(pkg_info, key)))
 
+        # The parsed license names are only required for the license checks.
         parsed_license_names: set[str] = set()
-        for license_expr in pkg_info.license_names:
-            parsed_license_names |= _parse_spdx(license_expr)
+        if parse_spdx is not None:
+            # Merge all parsed expressions in a single union. Empty and unknown names have nothing to parse.
+            parsed_license_names = parsed_license_names.union(
+                *(parse_spdx(license_expr) if license_expr and license_expr != LICENSE_UNKNOWN else (license_expr,) for license_expr in pkg_info.license_names)
+            )
 
         fail_this_pkg = False
         fail_message = ""
         if fail_on_licenses:
             if not args.partial_match:
-                failed_licenses = case_insensitive_set_intersect(parsed_license_names, fail_on_licenses)
+                failed_licenses = _case_insensitive_set_intersect(parsed_license_names, fail_on_licenses)
             else:
-                failed_licenses = case_insensitive_partial_match_set_intersect(parsed_license_names, fail_on_licenses)
+                failed_licenses, _ = _partial_match_split(parsed_license_names, fail_on_pattern)
             if failed_licenses:
                 fail_this_pkg = True
                 fail_message = "fail-on license {} was found for package {}:{}\n".format(
@@ -110,9 +140,9 @@ def get_packages(
                 )
         if allow_only_licenses:
             if not args.partial_match:
-                uncommon_licenses = case_insensitive_set_diff(parsed_license_names, allow_only_licenses)
+                uncommon_licenses = _case_insensitive_set_diff(parsed_license_names, allow_only_licenses)
             else:
-                uncommon_licenses = case_insensitive_partial_match_set_diff(parsed_license_names, allow_only_licenses)
+                _, uncommon_licenses = _partial_match_split(parsed_license_names, allow_only_pattern)
             if len(uncommon_licenses) == len(parsed_license_names):
                 fail_this_pkg = True
                 fail_message = "license {} not in allow-only licenses was found for package {}:{}\n".format(
@@ -137,37 +167,50 @@ def get_packages(
 
 def case_insensitive_set_intersect(set_a, set_b):
     """Same as set.intersection() but case-insensitive"""
-    common_items = set()
-    set_b_lower = {item.lower() for item in set_b}
-    for elem in set_a:
-        if elem.lower() in set_b_lower:
-            common_items.add(elem)
-    return common_items
+    return _case_insensitive_set_intersect(set_a, {item.lower() for item in set_b})
 
 
 def case_insensitive_partial_match_set_intersect(set_a, set_b):
-    common_items = set()
-    for item_a in set_a:
-        for item_b in set_b:
-            if item_b.lower() in item_a.lower():
-                common_items.add(item_a)
-    return common_items
+    return _partial_match_split(set_a, _compile_partial_match(item.lower() for item in set_b))[0]
 
 
 def case_insensitive_partial_match_set_diff(set_a, set_b):
-    uncommon_items = set_a.copy()
-    for item_a in set_a:
-        for item_b in set_b:
-            if item_b.lower() in item_a.lower():
-                uncommon_items.discard(item_a)
-    return uncommon_items
+    return _partial_match_split(set_a, _compile_partial_match(item.lower() for item in set_b))[1]
 
 
 def case_insensitive_set_diff(set_a, set_b):
     """Same as set.difference() but case-insensitive"""
-    uncommon_items = set()
-    set_b_lower = {item.lower() for item in set_b}
-    for elem in set_a:
-        if elem.lower() not in set_b_lower:
-            uncommon_items.add(elem)
-    return uncommon_items
+    return _case_insensitive_set_diff(set_a, {item.lower() for item in set_b})
+
+
+# The following variants expect `set_b_lower` to already be lowercase.
+
+
+def _case_insensitive_set_intersect(set_a, set_b_lower):
+    return {elem for elem in set_a if elem.lower() in set_b_lower}
+
+
+def _case_insensitive_set_diff(set_a, set_b_lower):
+    return {elem for elem in set_a if elem.lower() not in set_b_lower}
+
+
+def _compile_partial_match(set_b_lower: Iterable[str]) -> re.Pattern[str]:
+    alternatives = list(map(re.escape, set_b_lower))
+    if not alternatives:
+        # Without any patterns, nothing should match.
+        return re.compile("(?!)")
+    return re.compile("|".join(alternatives))
+
+
+def _partial_match_split(set_a, pattern_lower):
+    """
+    Split `set_a` into the items matching the pattern and the ones which do not, in a single pass.
+    """
+    matched = set()
+    unmatched = set()
+    for item_a in set_a:
+        if pattern_lower.search(item_a.lower()):
+            matched.add(item_a)
+        else:
+            unmatched.add(item_a)
+    return matched, unmatched
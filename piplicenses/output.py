@@ -4,17 +4,29 @@
 
 from __future__ import annotations
 
+import csv
+import json
 from collections import Counter
-from typing import TYPE_CHECKING, cast
+from dataclasses import fields
+from functools import lru_cache
+from io import StringIO
+from operator import attrgetter
+from typing import TYPE_CHECKING, Callable, cast
 
 from piplicenses_lib import LICENSE_UNKNOWN, PackageInfo
 from prettytable import HRuleStyle, PrettyTable
 
+from piplicenses.cli import FormatArg
 from piplicenses.collector import get_packages
 from piplicenses.constants import _FILE_ATTRIBUTES, _MULTI_VALUE_KEYS, DEFAULT_OUTPUT_FIELDS, FIELDS_TO_METADATA_KEYS, SUMMARY_FIELD_NAMES
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
 if TYPE_CHECKING:  # pragma: no cover
-    from collections.abc import Iterator, Sequence
+    from collections.abc import Iterable, Iterator, Sequence
 
     from prettytable import RowType
 
@@ -35,67 +47,119 @@ def _filter_files(package: PackageInfo, args: CustomNamespace) -> None:
         setattr(package, name, new_value)
 
 
+@lru_cache(maxsize=1024)
+def _join_sorted(names: frozenset[str] | tuple[str, ...]) -> str:
+    """
+    Join the sorted names, caching the result as most packages share a few license combinations
+    """
+    return "; ".join(sorted(names))
+
+
+_PACKAGE_ATTRIBUTES = frozenset(field.name for field in fields(PackageInfo)) | frozenset(dir(PackageInfo))
+
+# Single-value file fields, mapped to the list of `(filename, content)` tuples and the tuple index to retrieve.
+_FIRST_FILE_ENTRY_FIELDS = {
+    "LicenseFile": ("licenses", 0),
+    "LicenseText": ("licenses", 1),
+    "NoticeFile": ("notices", 0),
+    "NoticeText": ("notices", 1),
+}
+
+
+def _create_first_file_entry_getter(name: str, index: int) -> Callable[[PackageInfo], str]:
+    def getter(pkg: PackageInfo) -> str:
+        entries = getattr(pkg, name)
+        return cast(str, entries[0][index]) if entries else LICENSE_UNKNOWN
+
+    return getter
+
+
+def _create_field_getter(field: str) -> Callable[[PackageInfo], str | list[str]]:
+    if field == "License":
+        return lambda pkg: _join_sorted(frozenset(pkg.license_names))
+    if field == "License-Classifier":
+        return lambda pkg: _join_sorted(tuple(pkg.license_classifiers)) or LICENSE_UNKNOWN
+
+    if field in _FIRST_FILE_ENTRY_FIELDS:
+        # Index the stored list directly instead of advancing a fresh generator property.
+        return _create_first_file_entry_getter(*_FIRST_FILE_ENTRY_FIELDS[field])
+
+    key = field.lower()
+    if key not in _PACKAGE_ATTRIBUTES:
+        key = FIELDS_TO_METADATA_KEYS[field]
+        if field in _MULTI_VALUE_KEYS:
+            return lambda pkg: _handle_multiple_value_field(field, getattr(pkg, key))
+    return attrgetter(key)
+
+
 def create_licenses_table(
     args: CustomNamespace,
     output_fields: Sequence[str] = DEFAULT_OUTPUT_FIELDS,
+    packages: Iterable[PackageInfo] | None = None,
 ) -> PrettyTable:
     table = factory_styled_table_with_args(args, output_fields)
 
-    for pkg in get_packages(args):
+    if packages is None:
+        packages = get_packages(args)
+
+    packages = list(packages)
+    for pkg in packages:
         _filter_files(package=pkg, args=args)
-        row: list[str | list[str]] = []
-        for field in output_fields:
-            if field == "License":
-                license_set = pkg.license_names
-                license_str = "; ".join(sorted(license_set))
-                row.append(license_str)
-            elif field == "License-Classifier":
-                row.append("; ".join(sorted(pkg.license_classifiers)) or LICENSE_UNKNOWN)
-            elif hasattr(pkg, field.lower()):
-                row.append(cast(str, getattr(pkg, field.lower())))
-            else:
-                value = getattr(pkg, FIELDS_TO_METADATA_KEYS[field])
-                if field in _MULTI_VALUE_KEYS:
-                    row.append(_handle_multiple_value_field(field, value))
-                else:
-                    row.append(cast(str, value))
-        table.add_row(row)
+
+    # Build the table column by column to let `map` drive the getters instead of a Python-level loop per cell.
+    columns = [list(map(_create_field_getter(field), packages)) for field in output_fields]
+    table.add_rows(list(map(list, zip(*columns))))
 
     return table
 
 
-def create_summary_table(args: CustomNamespace) -> PrettyTable:
-    counts = Counter("; ".join(sorted(pkg.license_names)) for pkg in get_packages(args))
+def create_summary_table(
+    args: CustomNamespace,
+    packages: Iterable[PackageInfo] | None = None,
+) -> PrettyTable:
+    if packages is None:
+        packages = get_packages(args)
+
+    # Only format the distinct license combinations instead of each package.
+    counts = Counter(frozenset(pkg.license_names) for pkg in packages)
 
     table = factory_styled_table_with_args(args, SUMMARY_FIELD_NAMES)
-    for license_, count in counts.items():
-        table.add_row([count, license_])
+    table.add_rows([[count, _join_sorted(licenses)] for licenses, count in counts.items()])
     return table
 
 
 class JsonPrettyTable(PrettyTable):
     """PrettyTable-like class exporting to JSON"""
 
-    def format_row(self, row: RowType) -> dict[str, str | list[str]]:
-        result_row: dict[str, str | list[str]] = {}
-        for field, value in zip(self._field_names, row):
-            result_row[field] = value
+    json_encoder = json.JSONEncoder(indent=2, sort_keys=True)
+    orjson_option: int | None = None if orjson is None else orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS
 
-        return result_row
+    def format_row(self, row: RowType) -> dict[str, str | list[str]]:
+        return dict(zip(self._field_names, row))
 
     def get_string(self, **kwargs: str | list[str]) -> str:
-        # import included here in order to limit dependencies
-        # if not interested in JSON output,
-        # then the dependency is not required
-        import json
-
         options = self._get_options(kwargs)
         rows = self._get_rows(options)
         lines = [self.format_row(row) for row in rows]
-        return json.dumps(lines, indent=2, sort_keys=True)
+        if self.orjson_option is not None:
+            try:
+                result = orjson.dumps(lines, option=self.orjson_option).decode("utf-8")
+            except orjson.JSONEncodeError:
+                # For example, lone surrogates are rejected by orjson.
+                pass
+            else:
+                # orjson does not escape non-ASCII characters. Escaping them afterwards in Python is slower
+                # than the standard library, thus only use the orjson output if there is nothing to escape.
+                if result.isascii() and "\x7f" not in result:
+                    return result
+        return self.json_encoder.encode(lines)
 
 
 class JsonLicenseFinderTable(JsonPrettyTable):
+    json_encoder = json.JSONEncoder(sort_keys=True)
+    # The compact orjson output lacks the spaces after the separators emitted by the standard library.
+    orjson_option = None
+
     def format_row(self, row: RowType) -> dict[str, str | list[str]]:
         result_row: dict[str, str | list[str]] = {}
         for field, value in zip(self._field_names, row):
@@ -110,43 +174,21 @@ class JsonLicenseFinderTable(JsonPrettyTable):
 
         return result_row
 
-    def get_string(self, **kwargs: str | list[str]) -> str:
-        # import included here in order to limit dependencies
-        # if not interested in JSON output,
-        # then the dependency is not required
-        import json
-
-        options = self._get_options(kwargs)
-        rows = self._get_rows(options)
-        lines = [self.format_row(row) for row in rows]
-        return json.dumps(lines, sort_keys=True)
-
 
 class CSVPrettyTable(PrettyTable):
     """PrettyTable-like class exporting to CSV"""
 
     def get_string(self, **kwargs: str | list[str]) -> str:
-        def esc_quotes(val: bytes | str) -> str:
-            """
-            Meta-escaping double quotes
-            https://tools.ietf.org/html/rfc4180
-            """
-            try:
-                return cast(str, val).replace('"', '""')
-            except UnicodeDecodeError:  # pragma: no cover
-                return cast(bytes, val).decode("utf-8").replace('"', '""')
-            except UnicodeEncodeError:  # pragma: no cover
-                return str(cast(str, val).encode("unicode_escape").replace('"', '""'))  # type: ignore[arg-type]
-
         options = self._get_options(kwargs)
         rows = self._get_rows(options)
         formatted_rows = self._format_rows(rows)
 
-        lines: list[str] = []
-        formatted_header = ",".join([f'"{esc_quotes(val)}"' for val in self._field_names])
-        lines.append(formatted_header)
-        lines.extend([",".join([f'"{esc_quotes(val)}"' for val in row]) for row in formatted_rows])
-        return "\n".join(lines)
+        # Quote all values and escape double quotes by doubling them, see https://tools.ietf.org/html/rfc4180
+        output = StringIO()
+        writer = csv.writer(output, quoting=csv.QUOTE_ALL, lineterminator="\n")
+        writer.writerow(self._field_names)
+        writer.writerows(formatted_rows)
+        return output.getvalue().removesuffix("\n")
 
 
 class PlainVerticalTable(PrettyTable):
@@ -161,7 +203,9 @@ class PlainVerticalTable(PrettyTable):
         rows = self._get_rows(options)
         show_paths = "LicenseFiles" in kwargs["fields"]
 
-        output = ""
+        # Collect the lines and join them once instead of growing a string.
+        lines: list[str] = []
+        append = lines.append
         for row in rows:
             index = 0
             while index < len(row):
@@ -169,52 +213,52 @@ class PlainVerticalTable(PrettyTable):
                 if isinstance(v, list):
                     if show_paths:
                         for first_entry, second_entry in zip(v, row[index + 1]):
-                            output += "{}\n{}\n".format(first_entry, second_entry)
+                            append(f"{first_entry}\n{second_entry}\n")
                         index += 1
                     else:
                         for entry in v:
-                            output += "{}\n".format(entry)
+                            append(f"{entry}\n")
                 else:
-                    output += "{}\n".format(v)
+                    append(f"{v}\n")
                 index += 1
-            output += "\n"
+            append("\n")
+
+        return "".join(lines)
+
+
+# Formats rendered by dedicated table classes instead of a styled `PrettyTable`.
+_FORMAT_TO_TABLE_CLASS: dict[FormatArg, type[PrettyTable]] = {
+    FormatArg.JSON: JsonPrettyTable,
+    FormatArg.JSON_LICENSE_FINDER: JsonLicenseFinderTable,
+    FormatArg.CSV: CSVPrettyTable,
+    FormatArg.PLAIN_VERTICAL: PlainVerticalTable,
+}
+
+# Mapping of bordered formats to their junction character and horizontal rule style.
+_FORMAT_TO_BORDER_STYLE: dict[FormatArg, tuple[str, HRuleStyle]] = {
+    FormatArg.MARKDOWN: ("|", HRuleStyle.HEADER),
+    FormatArg.RST: ("+", HRuleStyle.ALL),
+    FormatArg.CONFLUENCE: ("|", HRuleStyle.NONE),
+}
 
-        return output
+_BORDERED_FORMATS = frozenset(_FORMAT_TO_BORDER_STYLE)
 
 
 def factory_styled_table_with_args(
     args: CustomNamespace,
     output_fields: Sequence[str] = DEFAULT_OUTPUT_FIELDS,
 ) -> PrettyTable:
-    from piplicenses.cli import FormatArg
+    table_class = _FORMAT_TO_TABLE_CLASS.get(args.format_)
+    if table_class is not None:
+        return table_class(list(output_fields))
 
     table = PrettyTable()
     table.field_names = output_fields  # type: ignore[assignment]
     table.align = "l"  # type: ignore[assignment]
-    table.border = args.format_ in {
-        FormatArg.MARKDOWN,
-        FormatArg.RST,
-        FormatArg.CONFLUENCE,
-        FormatArg.JSON,
-    }
+    table.border = args.format_ in _BORDERED_FORMATS
     table.header = True
 
-    if args.format_ == FormatArg.MARKDOWN:
-        table.junction_char = "|"
-        table.hrules = HRuleStyle.HEADER
-    elif args.format_ == FormatArg.RST:
-        table.junction_char = "+"
-        table.hrules = HRuleStyle.ALL
-    elif args.format_ == FormatArg.CONFLUENCE:
-        table.junction_char = "|"
-        table.hrules = HRuleStyle.NONE
-    elif args.format_ == FormatArg.JSON:
-        table = JsonPrettyTable(table.field_names)
-    elif args.format_ == FormatArg.JSON_LICENSE_FINDER:
-        table = JsonLicenseFinderTable(table.field_names)
-    elif args.format_ == FormatArg.CSV:
-        table = CSVPrettyTable(table.field_names)
-    elif args.format_ == FormatArg.PLAIN_VERTICAL:
-        table = PlainVerticalTable(table.field_names)
+    if table.border:
+        table.junction_char, table.hrules = _FORMAT_TO_BORDER_STYLE[args.format_]
 
     return table
@@ -3,6 +3,7 @@
 # SPDX-FileCopyrightText: Copyright (c) 2025 stefan6419846
 
 import functools
+import importlib.util
 import warnings
 from typing import Protocol
 
@@ -11,12 +12,35 @@ from piplicenses.errors import PipLicensesWarning
 
 
 class SpdxParser(Protocol):
-    def __call__(self, expression: str) -> set[str]:  # pragma: no cover
+    def __call__(self, expression: str) -> frozenset[str]:  # pragma: no cover
         pass
 
 
+_SPDX_PARSER: SpdxParser | None = None
+
+
 @functools.lru_cache(maxsize=1)
+def _register_spdx_system_packages() -> None:
+    """
+    Register the packages of the extra "spdx" as system packages if it is installed.
+
+    This does not import the packages, thus the parser itself is only created when required.
+    """
+    if importlib.util.find_spec("license_expression") is not None:
+        SYSTEM_PACKAGES.extend(("license-expression", "boolean-py"))
+
+
 def _get_spdx_parser() -> SpdxParser:
+    """
+    Get the SPDX expression parser, creating it on first use.
+    """
+    global _SPDX_PARSER
+    if _SPDX_PARSER is None:
+        _SPDX_PARSER = _create_spdx_parser()
+    return _SPDX_PARSER
+
+
+def _create_spdx_parser() -> SpdxParser:
     """
     Create an SPDX expression parser.
 
@@ -28,43 +52,41 @@ def _get_spdx_parser() -> SpdxParser:
 
     except ImportError:
 
-        def dummy_parser(expression: str) -> set[str]:
-            return {expression}
+        def dummy_parser(expression: str) -> frozenset[str]:
+            return frozenset((expression,))
 
         return dummy_parser
 
-    SYSTEM_PACKAGES.append("license-expression")
-    SYSTEM_PACKAGES.append("boolean-py")
-
     licensing = get_spdx_licensing()
 
-    def parser(expression: str) -> set[str]:
+    # License expressions repeat heavily across packages, thus parse each distinct one only once.
+    # The warning is not part of the cached result to emit it for every occurrence.
+    @functools.lru_cache(maxsize=None)
+    def parse(expression: str) -> tuple[frozenset[str], str | None]:
         try:
             result = licensing.validate(expression)
         except Exception:
             # https://github.com/aboutcode-org/license-expression/issues/97
-            return {expression}
+            return frozenset((expression,)), None
         if result.errors:
-            return {expression}
+            return frozenset((expression,)), None
         parsed = licensing.parse(expression)
         if parsed is None:
-            return {expression}
+            return frozenset((expression,)), None
         parsed = parsed.simplify()
         parsed_str = str(parsed)
         if "AND" in parsed_str or "WITH" in parsed_str:
+            return frozenset((expression,)), parsed_str
+        return frozenset(parsed.objects), None
+
+    def parser(expression: str) -> frozenset[str]:
+        licenses, unsupported = parse(expression)
+        if unsupported is not None:
             warnings.warn(
-                f"SPDX expressions with 'AND' or 'WITH' are currently not supported. The expression {parsed} is treated as the literal {expression!r}.",
+                f"SPDX expressions with 'AND' or 'WITH' are currently not supported. The expression {unsupported} is treated as the literal {expression!r}.",
                 category=PipLicensesWarning,
                 stacklevel=2,
             )
-            return {expression}
-        return {license_name for license_name in parsed.objects}
+        return licenses
 
     return parser
-
-
-def _parse_spdx(
-    expression: str,
-) -> set[str]:
-    """Parse a license expression and return a set of licenses."""
-    return _get_spdx_parser()(expression)
@@ -2,29 +2,37 @@
 # SPDX-FileCopyrightText: Copyright (c) 2018 raimon
 # SPDX-FileCopyrightText: Copyright (c) 2025 stefan6419846
 
+import os
 import re
 from contextlib import redirect_stderr
 from enum import Enum
-from io import StringIO
+from io import BytesIO, StringIO, TextIOWrapper
 from pathlib import Path
-from tempfile import NamedTemporaryFile, TemporaryFile
+from tempfile import NamedTemporaryFile, TemporaryDirectory, TemporaryFile
 from unittest import TestCase, mock
 
 import tomli_w
 from black.mode import auto
-from piplicenses_lib import FromArg, __pkgname__
+from piplicenses_lib import FromArg, NoValueEnum, __pkgname__
 
 from piplicenses.cli import (
+    _CONFIG_CACHE,
+    _split_help_marker,
+    _xmlcharref_non_ascii,
+    choices_from_enum,
     create_output_string,
     create_parser,
     create_warn_string,
     enum_key_to_value,
     get_output_fields,
+    get_parser,
     get_sortby,
     load_config_from_file,
     output_colored,
+    reset_parser,
     save_if_needs,
     value_to_enum_key,
+    write_output,
 )
 from piplicenses.constants import TOML_SECTION_NAME
 from tests import CaptureOutput, CommandLineTestCase
@@ -39,6 +47,11 @@ class CreateOutputStringTestCase(CommandLineTestCase):
         self.assertIn("<table>", output_string)
         self.assertIn("Jukka Lehtosalo &lt;jukka.lehtosalo@iki.fi&gt;", output_string)  # author of "mypy"
 
+    def test_xmlcharref_non_ascii(self) -> None:
+        for text in ["<td>MIT</td>", "<td>Caf\N{LATIN SMALL LETTER E WITH ACUTE} \N{GRINNING FACE}</td>", "\x7f\x80\udc80"]:
+            with self.subTest(text=text):
+                self.assertEqual(text.encode("ascii", errors="xmlcharrefreplace").decode("ascii"), _xmlcharref_non_ascii(text))
+
     def test_format_json(self) -> None:
         format_json_args = ["--format=json", "--with-authors"]
         args = self.parser.parse_args(format_json_args)
@@ -157,12 +170,137 @@ class ParserTestCase(TestCase):
             self.assertEqual(tool_conf["ignore-packages"], args.ignore_packages)
             self.assertEqual(tool_conf["fail-on"], args.fail_on)
 
+            # Modifying the parsed values does not leak into other parsers.
+            args.ignore_packages.append("package3")
+            self.assertEqual(tool_conf["ignore-packages"], create_parser(temp_file.name).parse_args([]).ignore_packages)
+
+
+class SplitHelpMarkerTestCase(TestCase):
+    def test_without_marker(self) -> None:
+        self.assertEqual(("", "show the version"), _split_help_marker("show the version"))
+        self.assertEqual(("", "path | url"), _split_help_marker("path | url"))
+
+    def test_indent_marker(self) -> None:
+        self.assertEqual(("I", "dump as json"), _split_help_marker("I|dump as json"))
+
+    def test_split_marker(self) -> None:
+        self.assertEqual(("R", "line 1\nline 2"), _split_help_marker("R|line 1\nline 2"))
+        self.assertEqual(("IR", "line 1\nline 2"), _split_help_marker("IR|line 1\nline 2"))
+
+
+class GetParserTestCase(TestCase):
+    def test_cached(self) -> None:
+        self.addCleanup(reset_parser)
+        reset_parser()
+
+        parser = get_parser()
+        self.assertIs(parser, get_parser())
+
+        reset_parser()
+        self.assertIsNot(parser, get_parser())
+
+    def test_configuration_file_changed(self) -> None:
+        self.addCleanup(reset_parser)
+
+        with TemporaryDirectory() as directory:
+            path = Path(directory, "pyproject.toml")
+            parser = get_parser(str(path))
+            self.assertIs(parser, get_parser(str(path)))
+            self.assertFalse(parser.parse_args([]).summary)
+
+            path.write_text(tomli_w.dumps({"tool": {TOML_SECTION_NAME: {"summary": True}}}))
+            parser = get_parser(str(path))
+            self.assertIs(parser, get_parser(str(path)))
+            self.assertTrue(parser.parse_args([]).summary)
+
+    def test_list_defaults_not_shared(self) -> None:
+        self.addCleanup(reset_parser)
+
+        with TemporaryDirectory() as directory:
+            path = Path(directory, "pyproject.toml")
+            path.write_text(tomli_w.dumps({"tool": {TOML_SECTION_NAME: {"ignore-packages": ["package1"]}}}))
+            parser = get_parser(str(path))
+
+            args = parser.parse_args([])
+            args.ignore_packages.append("package2")
+            args.packages.append("package3")
+            self.assertIs(parser, get_parser(str(path)))
+            args = get_parser(str(path)).parse_args([])
+            self.assertEqual(["package1"], args.ignore_packages)
+            self.assertEqual([], args.packages)
+
 
 class LoadConfigFromFileTestCase(TestCase):
     def test_load_non_existent_file(self) -> None:
         with NamedTemporaryFile() as fd:
             pass
-        self.assertDictEqual({}, load_config_from_file(fd.name))
+        config = load_config_from_file(fd.name)
+        self.assertEqual({}, dict(config))
+        self.assertIs(config, load_config_from_file(fd.name))
+        with self.assertRaises(TypeError):
+            config["summary"] = False  # type: ignore[index]
+
+    def test_cached(self) -> None:
+        with TemporaryDirectory() as directory:
+            path = Path(directory, "pyproject.toml")
+            path.write_text(tomli_w.dumps({"tool": {TOML_SECTION_NAME: {"summary": True}}}))
+
+            config = load_config_from_file(str(path))
+            self.assertEqual({"summary": True}, dict(config))
+            self.assertIs(config, load_config_from_file(str(path)))
+            with self.assertRaises(TypeError):
+                config["summary"] = False  # type: ignore[index]
+
+            # Nested values are read-only as well.
+            path.write_text(tomli_w.dumps({"tool": {TOML_SECTION_NAME: {"packages": ["package1"], "extra": {"key": ["value"]}}}}))
+            config = load_config_from_file(str(path))
+            self.assertEqual(("package1",), config["packages"])
+            self.assertEqual({"key": ("value",)}, dict(config["extra"]))
+            with self.assertRaises(TypeError):
+                config["extra"]["key"] = []
+
+            # A modified file is parsed again.
+            path.write_text(tomli_w.dumps({"tool": {TOML_SECTION_NAME: {"summary": False, "with-system": True}}}))
+            self.assertEqual({"summary": False, "with-system": True}, dict(load_config_from_file(str(path))))
+
+    def test_cache_entry_replaced(self) -> None:
+        self.addCleanup(reset_parser)
+
+        with TemporaryDirectory() as directory:
+            path = Path(directory, "pyproject.toml")
+            key = str(path.absolute())
+            for value in ["a", "bb", "ccc"]:
+                path.write_text(tomli_w.dumps({"tool": {TOML_SECTION_NAME: {"python": value}}}))
+                self.assertEqual({"python": value}, dict(load_config_from_file(str(path))))
+                self.assertEqual(1, sum(cache_key == key for cache_key in _CONFIG_CACHE))
+
+            # Removed files and resetting drop the entry.
+            path.unlink()
+            self.assertEqual({}, dict(load_config_from_file(str(path))))
+            self.assertNotIn(key, _CONFIG_CACHE)
+            path.write_text(tomli_w.dumps({"tool": {TOML_SECTION_NAME: {"python": "a"}}}))
+            load_config_from_file(str(path))
+            self.assertIn(key, _CONFIG_CACHE)
+            reset_parser()
+            self.assertNotIn(key, _CONFIG_CACHE)
+
+    def test_cached_relative_path(self) -> None:
+        cwd = os.getcwd()
+        self.addCleanup(os.chdir, cwd)
+
+        with TemporaryDirectory() as directory1, TemporaryDirectory() as directory2:
+            for directory, python in [(directory1, "python-1"), (directory2, "python-2")]:
+                path = Path(directory, "pyproject.toml")
+                path.write_text(tomli_w.dumps({"tool": {TOML_SECTION_NAME: {"python": python}}}))
+                # Only differ by the directory, not by modification time or size.
+                os.utime(path, ns=(0, 0))
+
+            for directory, python in [(directory1, "python-1"), (directory2, "python-2")]:
+                with self.subTest(directory=directory):
+                    os.chdir(directory)
+                    self.assertEqual({"python": python}, dict(load_config_from_file("pyproject.toml")))
+            # Leave the directories before removing them.
+            os.chdir(cwd)
 
 
 class EnumTestCase(TestCase):
@@ -180,13 +318,20 @@ class EnumTestCase(TestCase):
         self.assertEqual("json-license-finder", enum_key_to_value(TestEnum.JSON_LICENSE_FINDER))
         self.assertEqual("plain", enum_key_to_value(TestEnum.PLAIN))
 
+    def test_choices_from_enum(self) -> None:
+        class TestEnum(NoValueEnum):
+            PLAIN = P = auto()
+            JSON_LICENSE_FINDER = JLF = auto()
+
+        self.assertEqual(["plain", "p", "json-license-finder", "jlf"], choices_from_enum(TestEnum))
+
 
 class SaveIfNeedsTestCase(TestCase):
     def test_output_file_success(self) -> None:
         def mocked_open(*args, **kwargs):
-            return TemporaryFile("w")
+            return TemporaryFile("wb")
 
-        with mock.patch("piplicenses.cli.open", mocked_open), mock.patch("sys.exit"), CaptureOutput() as captured:
+        with mock.patch("builtins.open", mocked_open), mock.patch("sys.exit"), CaptureOutput() as captured:
             save_if_needs("/foo/bar.txt", "license list")
 
         self.assertIn("created path: ", captured.stdout)
@@ -196,7 +341,7 @@ class SaveIfNeedsTestCase(TestCase):
         def mocked_open(*args, **kwargs):
             raise OSError
 
-        with mock.patch("piplicenses.cli.open", mocked_open), mock.patch("sys.exit"), CaptureOutput() as captured:
+        with mock.patch("builtins.open", mocked_open), mock.patch("sys.exit"), CaptureOutput() as captured:
             save_if_needs("/foo/bar.txt", "license list")
 
         self.assertEqual("", captured.stdout)
@@ -223,6 +368,70 @@ class SaveIfNeedsTestCase(TestCase):
         self.assertEqual(f"created path: {fd.name}\n" * 2, captured.stdout)
         self.assertEqual("", captured.stderr)
 
+    def test_output_file_content_large(self) -> None:
+        output_string = "license list\n" * (1 << 17)
+        with NamedTemporaryFile() as fd, mock.patch("sys.exit"), CaptureOutput() as captured:
+            fd.close()
+
+            save_if_needs(fd.name, output_string)
+            self.assertEqual(output_string, Path(fd.name).read_text())
+
+            save_if_needs(fd.name, "Hello World!")
+            self.assertEqual("Hello World!\n", Path(fd.name).read_text())
+
+        self.assertEqual(f"created path: {fd.name}\n" * 2, captured.stdout)
+        self.assertEqual("", captured.stderr)
+
+
+class WriteOutputTestCase(TestCase):
+    def test_text_stream(self) -> None:
+        stream = StringIO()
+        write_output(stream, "license list")
+        write_output(stream, "license list\n")
+        self.assertEqual("license list\nlicense list\n\n", stream.getvalue())
+
+    def test_binary_buffer(self) -> None:
+        raw = BytesIO()
+        stream = TextIOWrapper(raw, encoding="utf-8")
+        stream.write("header\n")
+        write_output(stream, "license list \N{SNOWMAN}")
+        self.assertEqual("header\nlicense list \N{SNOWMAN}\n".encode("utf-8"), raw.getvalue())
+
+    def test_binary_buffer_stateful_encoding(self) -> None:
+        raw = BytesIO()
+        stream = TextIOWrapper(raw, encoding="utf-16")
+        write_output(stream, "license list")
+        stream.flush()
+        self.assertEqual("license list\n".encode("utf-16"), raw.getvalue())
+
+        # Neither previous nor repeated output leads to another BOM.
+        for encoding in ("utf-16", "utf-8-sig"):
+            with self.subTest(encoding=encoding):
+                raw = BytesIO()
+                stream = TextIOWrapper(raw, encoding=encoding)
+                stream.write("header\n")
+                write_output(stream, "license list")
+                write_output(stream, "warning")
+                stream.flush()
+                self.assertEqual("header\nlicense list\nwarning\n".encode(encoding), raw.getvalue())
+
+    def test_binary_buffer_translated_newlines(self) -> None:
+        raw = BytesIO()
+        stream = TextIOWrapper(raw, encoding="utf-8", newline="\r\n")
+        with mock.patch("piplicenses.cli.os.linesep", "\r\n"):
+            write_output(stream, "line 1\nline 2")
+        stream.flush()
+        self.assertEqual(b"line 1\r\nline 2\r\n", raw.getvalue())
+
+    def test_no_stream(self) -> None:
+        write_output(None, "license list")
+
+    def test_binary_buffer_encoding_errors(self) -> None:
+        raw = BytesIO()
+        stream = TextIOWrapper(raw, encoding="ascii", errors="replace")
+        write_output(stream, "license list \N{SNOWMAN}")
+        self.assertEqual(b"license list ?\n", raw.getvalue())
+
 
 class OutputColoredTestCase(TestCase):
 
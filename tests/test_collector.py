@@ -6,6 +6,7 @@ from unittest import TestCase
 
 from piplicenses.cli import CustomNamespace
 from piplicenses.collector import (
+    _create_value_filter,
     _should_include_files,
     case_insensitive_partial_match_set_diff,
     case_insensitive_partial_match_set_intersect,
@@ -67,6 +68,34 @@ class GetPackagesTestCase(PatchDistributionsTestCase):
         self.assertNotIn(UNICODE_APPENDIX, packages[-1].summary)
 
 
+class CreateValueFilterTestCase(TestCase):
+    def test_filter(self) -> None:
+        filter_value = _create_value_filter("ascii")
+
+        self.assertEqual("MIT License", filter_value("MIT License"))
+        self.assertEqual("Caf License", filter_value("Caf\N{LATIN SMALL LETTER E WITH ACUTE} License"))
+        self.assertEqual(
+            [("LICENSE", "Copyright  Author")],
+            filter_value([("LICENSE", "Copyright \N{COPYRIGHT SIGN} Author")]),
+        )
+        self.assertEqual({"MIT", "BSD"}, filter_value({"MIT", "BSD\N{SNOWMAN}"}))
+
+    def test_filter_str_subclass(self) -> None:
+        class Text(str):
+            pass
+
+        filter_value = _create_value_filter("ascii")
+
+        filtered = filter_value(Text("Caf\N{LATIN SMALL LETTER E WITH ACUTE} License"))
+        self.assertEqual("Caf License", filtered)
+        self.assertIs(str, type(filtered))
+
+    def test_filter_code_page(self) -> None:
+        filter_value = _create_value_filter("latin1")
+
+        self.assertEqual("Caf\N{LATIN SMALL LETTER E WITH ACUTE} ", filter_value("Caf\N{LATIN SMALL LETTER E WITH ACUTE} \N{SNOWMAN}"))
+
+
 class ParseLicensesListTestCase(TestCase):
     def test_parse_licenses_list(self) -> None:
         licenses_str = " MIT License;;  MIT    ;  Apache-2.0;;;    "
@@ -210,3 +239,9 @@ class CaseInsensitivePartialMatchSetIntersectTestCase(TestCase):
         self.assertSetEqual(set_a, a_intersect_c)
         self.assertSetEqual({"revised BSD"}, b_intersect_c)
         self.assertSetEqual(set(), a_intersect_empty)
+
+    def test_special_characters(self) -> None:
+        set_a = {"Mozilla Public License 2.0 (MPL 2.0)", "MPL 2x0"}
+        set_b = {"(mpl 2.0)"}
+        result = case_insensitive_partial_match_set_intersect(set_a, set_b)
+        self.assertSetEqual({"Mozilla Public License 2.0 (MPL 2.0)"}, result)
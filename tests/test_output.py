@@ -2,14 +2,31 @@
 # SPDX-FileCopyrightText: Copyright (c) 2018 raimon
 # SPDX-FileCopyrightText: Copyright (c) 2025 stefan6419846
 
+import json
+from importlib.metadata import PathDistribution
+from unittest import TestCase, mock
+
 from docutils.frontend import get_default_settings
 from docutils.parsers.rst import Parser
 from docutils.utils import new_document
-from piplicenses_lib import LICENSE_UNKNOWN
+from piplicenses_lib import LICENSE_UNKNOWN, PackageInfo
 from prettytable import HRuleStyle
 
-from piplicenses.output import _handle_multiple_value_field, create_licenses_table, factory_styled_table_with_args
-from tests import PatchDistributionsTestCase
+from piplicenses.output import (
+    CSVPrettyTable,
+    JsonPrettyTable,
+    _create_field_getter,
+    _handle_multiple_value_field,
+    create_licenses_table,
+    create_summary_table,
+    factory_styled_table_with_args,
+)
+from tests import CommandLineTestCase, PatchDistributionsTestCase
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
 
 
 class CreateLicensesTableTestCase(PatchDistributionsTestCase):
@@ -69,6 +86,100 @@ class CreateLicensesTableTestCase(PatchDistributionsTestCase):
         self.assertEqual(HRuleStyle.NONE, table.hrules)
 
 
+class CreateTablesWithPackagesTestCase(CommandLineTestCase):
+    def _create_package(self, name: str, license_names: set[str]) -> PackageInfo:
+        return PackageInfo(
+            name=name,
+            version="1.0",
+            distribution=PathDistribution.from_name("pip-licenses-lib"),
+            license_names=license_names,
+        )
+
+    def test_licenses_table(self) -> None:
+        packages = [self._create_package("package-a", {"MIT"}), self._create_package("package-b", {"BSD", "Apache-2.0"})]
+        args = self.parser.parse_args([])
+        with mock.patch("piplicenses.output.get_packages") as get_packages:
+            table = create_licenses_table(args, ["Name", "Version", "License"], packages)
+        get_packages.assert_not_called()
+
+        self.assertEqual([["package-a", "1.0", "MIT"], ["package-b", "1.0", "Apache-2.0; BSD"]], table.rows)
+
+    def test_summary_table(self) -> None:
+        packages = [
+            self._create_package("package-a", {"MIT"}),
+            self._create_package("package-b", {"BSD", "Apache-2.0"}),
+            self._create_package("package-c", {"MIT"}),
+        ]
+        args = self.parser.parse_args(["--summary"])
+        with mock.patch("piplicenses.output.get_packages") as get_packages:
+            table = create_summary_table(args, packages)
+        get_packages.assert_not_called()
+
+        self.assertEqual([[2, "MIT"], [1, "Apache-2.0; BSD"]], table.rows)
+
+    def test_summary_table_collects_packages(self) -> None:
+        packages = [self._create_package("package-a", {"MIT"}), self._create_package("package-b", {"MIT"})]
+        args = self.parser.parse_args(["--summary"])
+        with mock.patch("piplicenses.output.get_packages", return_value=iter(packages)) as get_packages:
+            table = create_summary_table(args)
+        get_packages.assert_called_once_with(args)
+
+        self.assertEqual([[2, "MIT"]], table.rows)
+
+
+class CSVPrettyTableTestCase(TestCase):
+    def test_escaping(self) -> None:
+        table = CSVPrettyTable(["Name", "Author"])
+        table.add_row(["package-a", 'Jane "JD" Doe, John Doe'])
+        table.add_row(["package-b", "Line 1\nLine 2"])
+
+        self.assertEqual(
+            '"Name","Author"\n"package-a","Jane ""JD"" Doe, John Doe"\n"package-b","Line 1\nLine 2"',
+            table.get_string(),
+        )
+
+
+class JsonPrettyTableTestCase(TestCase):
+    def _create_table(self, text: str) -> JsonPrettyTable:
+        table = JsonPrettyTable(["Name", "LicenseTexts"])
+        table.add_row(["package-a", [text, ""]])
+        table.add_row(["package-b", []])
+        return table
+
+    def test_orjson_matches_standard_library(self) -> None:
+        if orjson is None:
+            raise self.skipTest("Requires orjson package.")
+
+        for text in [
+            "MIT License",
+            'Copyright "Author" \\ / \n\t\b\f\r\x01\x7f',
+            "Copyright \N{COPYRIGHT SIGN} \N{LINE SEPARATOR} \N{GRINNING FACE}",
+            "Lone \udc80 surrogate",
+        ]:
+            with self.subTest(text=text):
+                table = self._create_table(text)
+                result = table.get_string()
+                with mock.patch.object(JsonPrettyTable, "orjson_option", None):
+                    self.assertEqual(table.get_string(), result)
+                self.assertEqual(json.dumps([{"LicenseTexts": [text, ""], "Name": "package-a"}, {"LicenseTexts": [], "Name": "package-b"}], indent=2), result)
+
+    def test_non_ascii_uses_standard_library(self) -> None:
+        if orjson is None:
+            raise self.skipTest("Requires orjson package.")
+
+        for text, uses_standard_library in [
+            ("MIT License", False),
+            ("Copyright \N{COPYRIGHT SIGN} J\N{LATIN SMALL LETTER U WITH DIAERESIS}rgen", True),
+            ("Copyright \x7f", True),
+        ]:
+            with self.subTest(text=text):
+                table = self._create_table(text)
+                with mock.patch.object(JsonPrettyTable, "json_encoder", wraps=JsonPrettyTable.json_encoder) as json_encoder:
+                    result = table.get_string()
+                self.assertEqual(uses_standard_library, json_encoder.encode.called)
+                self.assertEqual(json.dumps([{"LicenseTexts": [text, ""], "Name": "package-a"}, {"LicenseTexts": [], "Name": "package-b"}], indent=2), result)
+
+
 class FactoryStyledTableWithArgsTestCase(PatchDistributionsTestCase):
     def test_format_plain(self) -> None:
         format_plain_args = ["--format=plain"]
@@ -89,3 +200,18 @@ class HandleMultipleValueFieldTestCase(PatchDistributionsTestCase):
 
         self.assertEqual(LICENSE_UNKNOWN, _handle_multiple_value_field("LicenseFile", iter([])))
         self.assertEqual("path1", _handle_multiple_value_field("LicenseFile", iter(["path1", "path2"])))
+
+
+class CreateFieldGetterTestCase(TestCase):
+    def test_first_file_entry(self) -> None:
+        package = PackageInfo(
+            name="dummy",
+            version="1.0",
+            distribution=PathDistribution.from_name("pip-licenses-lib"),
+            licenses=[("LICENSE", "license text"), ("COPYING", "copying text")],
+        )
+
+        self.assertEqual("LICENSE", _create_field_getter("LicenseFile")(package))
+        self.assertEqual("license text", _create_field_getter("LicenseText")(package))
+        self.assertEqual(LICENSE_UNKNOWN, _create_field_getter("NoticeFile")(package))
+        self.assertEqual(LICENSE_UNKNOWN, _create_field_getter("NoticeText")(package))
@@ -3,10 +3,11 @@
 # SPDX-FileCopyrightText: Copyright (c) 2025 stefan6419846
 
 import warnings
-from unittest import TestCase
+from unittest import TestCase, mock
 
+from piplicenses.constants import SYSTEM_PACKAGES
 from piplicenses.errors import PipLicensesWarning
-from piplicenses.spdx import _get_spdx_parser
+from piplicenses.spdx import _create_spdx_parser, _get_spdx_parser, _register_spdx_system_packages
 
 try:
     import license_expression
@@ -41,6 +42,38 @@ class SpdxParserTestCase(TestCase):
                 else:
                     self.assertEqual(expected, _get_spdx_parser()(expression))
 
+    def test_has_license_expression_package_repeated(self):
+        if license_expression is None:
+            raise self.skipTest("Requires license-expression package.")
+
+        parser = _get_spdx_parser()
+        self.assertIs(parser("MIT OR Apache-2.0"), parser("MIT OR Apache-2.0"))
+
+        with warnings.catch_warnings(record=True) as caught_warnings:
+            warnings.simplefilter("always")
+            for _ in range(2):
+                self.assertEqual({"MIT AND Apache-2.0"}, parser("MIT AND Apache-2.0"))
+        self.assertEqual(2, len(caught_warnings), caught_warnings)
+
+    def test_has_license_expression_package_validate_fails(self):
+        if license_expression is None:
+            raise self.skipTest("Requires license-expression package.")
+
+        licensing = mock.Mock()
+        licensing.validate.side_effect = AttributeError("'NoneType' object has no attribute 'render'")
+        with mock.patch("license_expression.get_spdx_licensing", return_value=licensing):
+            parser = _create_spdx_parser()
+        self.assertEqual({"MIT OR"}, parser("MIT OR"))
+        licensing.validate.assert_called_once_with("MIT OR")
+        licensing.parse.assert_not_called()
+
+    def test_register_system_packages(self):
+        _register_spdx_system_packages()
+        _register_spdx_system_packages()
+        for package_name in ("license-expression", "boolean-py"):
+            with self.subTest(package_name=package_name):
+                self.assertEqual(0 if license_expression is None else 1, SYSTEM_PACKAGES.count(package_name))
+
     def test_does_not_have_license_expression_package(self):
         if license_expression is not None:
             raise self.skipTest("Does not work with license-expression package.")